@@ -134,16 +134,50 @@ def read_frame(filename, ifo, readstrain=True, strain_chan=None, dq_chan=None, i
 
     return strain, gpsStart, ts, qmask, shortnameList, injmask, injnamelist
 
+def _import_h5py():
+    """
+    Helper function to import h5py for the HDF5 readers
+
+    If hdf5plugin is installed it is imported too, which registers
+    the bitshuffle/LZ4 filters needed to read repacked files.
+    """
+    import h5py
+    try:
+        import hdf5plugin
+    except ImportError:
+        pass
+    return h5py
+
+def read_dataset(dset, filename):
+    """
+    Helper function to read a whole HDF5 dataset
+
+    Contiguous datasets are memory-mapped straight from FILENAME,
+    avoiding the copy through the HDF5 library.  The map is 
+    copy-on-write, so the returned array can be modified without
+    touching the file.  Chunked (e.g. compressed) datasets are read
+    into a preallocated array with read_direct.
+    """
+    offset = dset.id.get_offset()
+    if dset.chunks is None and offset is not None:
+        return np.memmap(filename, dtype=dset.dtype, mode='c', offset=offset, shape=dset.shape)
+
+    data = np.empty(dset.shape, dtype=dset.dtype)
+    dset.read_direct(data)
+    return data
+
 def read_hdf5(filename, readstrain=True):
     """
     Helper function to read HDF5 files
     """
-    import h5py
-    dataFile = h5py.File(filename, 'r')
+    h5py = _import_h5py()
+    #-- Use a 64 MB chunk cache so chunked strain datasets are read
+    #-- without refetching chunks; this is a no-op for contiguous files
+    dataFile = h5py.File(filename, 'r', rdcc_nbytes=64*1024*1024, rdcc_nslots=100003)
 
     #-- Read the strain
     if readstrain:
-        strain = dataFile['strain']['Strain'][...]
+        strain = read_dataset(dataFile['strain']['Strain'], filename)
     else:
         strain = 0
 
@@ -168,6 +202,26 @@ def read_hdf5(filename, readstrain=True):
     dataFile.close()
     return strain, gpsStart, ts, qmask, shortnameList, injmask, injnameList
 
+def read_template(filename):
+    """
+    Helper function to read a LOSC waveform template HDF5 file
+
+    The return value is: 
+    TEMPLATE_P, TEMPLATE_C
+
+    TEMPLATE_P and TEMPLATE_C are the plus and cross polarizations
+    of the template waveform.
+    """
+    h5py = _import_h5py()
+    dataFile = h5py.File(filename, 'r')
+
+    #-- Read both polarizations
+    template = read_dataset(dataFile['template'], filename)
+
+    dataFile.close()
+    template_p, template_c = template
+    return template_p, template_c
+
 def loaddata(filename, ifo=None, tvec=True, readstrain=True, strain_chan=None, dq_chan=None, inj_chan=None):
     """
     The input filename should be a LOSC .hdf5 file or a LOSC .gwf
@@ -27,14 +27,18 @@ except NameError:
 if not DATA_DIR.exists():
     pytest.skip("Data directory not found. Skipping all readligo tests.", allow_module_level=True)
 
+# List the data directory once; the checks below look names up in this set
+# instead of calling .exists() on each path.
+DATA_FILES = {entry.name for entry in os.scandir(DATA_DIR)}
+
 # Build paths to the files
-fn_H1 = DATA_DIR / 'H-H1_LOSC_4_V1-1126259446-32.hdf5'
-fn_L1 = DATA_DIR / 'L-L1_LOSC_4_V1-1126259446-32.hdf5'
+fn_H1 = DATA_DIR / 'H-H1_LOSC_4_V2-1126259446-32.hdf5'
+fn_L1 = DATA_DIR / 'L-L1_LOSC_4_V2-1126259446-32.hdf5'
 fn_template = DATA_DIR / 'GW150914_4_template.hdf5'
 
 # --- Tests ---
 
-@pytest.mark.skipif(not fn_H1.exists(), reason="H1 data file not found")
+@pytest.mark.skipif(fn_H1.name not in DATA_FILES, reason="H1 data file not found")
 def test_loaddata_returns_correct_types():
     """
     Test that rl.loaddata() returns the expected data types.
@@ -47,11 +51,11 @@ def test_loaddata_returns_correct_types():
     assert isinstance(chan_dict, dict), "Channel dictionary is not a dict"
 
     # Check L1 data
-    if fn_L1.exists():
+    if fn_L1.name in DATA_FILES:
         strain_L1, _, _ = rl.loaddata(str(fn_L1), 'L1')
         assert isinstance(strain_L1, np.ndarray), "L1 Strain data is not a numpy array"
 
-@pytest.mark.skipif(not fn_H1.exists(), reason="H1 data file not found")
+@pytest.mark.skipif(fn_H1.name not in DATA_FILES, reason="H1 data file not found")
 def test_loaddata_returns_correct_length():
     """
     Test that rl.loaddata() returns strain and time arrays of the same length.
@@ -63,7 +67,20 @@ def test_loaddata_returns_correct_length():
     assert time is not None, "Time should not be None"
     assert len(strain) == len(time), "Strain and time arrays have different lengths"
 
-@pytest.mark.skipif(not fn_template.exists(), reason="Template file not found")
+@pytest.mark.skipif(fn_H1.name not in DATA_FILES, reason="H1 data file not found")
+def test_loaddata_strain_matches_hdf5():
+    """
+    Test that rl.loaddata() returns the same strain values as reading
+    the strain dataset with h5py directly.
+    """
+    import h5py
+    with h5py.File(fn_H1, 'r') as f:
+        expected = f['strain/Strain'][...]
+
+    strain, _, _ = rl.loaddata(str(fn_H1), 'H1')
+    assert np.array_equal(strain, expected), "Strain values differ from the file"
+
+@pytest.mark.skipif(fn_template.name not in DATA_FILES, reason="Template file not found")
 def test_read_template_returns_correct_types():
     """
     Test that rl.read_template() returns two numpy arrays.
@@ -77,4 +94,18 @@ def test_read_template_returns_correct_types():
     except AttributeError:
         pytest.skip("read_template function not found in readligo. Skipping test.")
     except Exception as e:
-        pytest.fail(f"read_template test failed with an exception: {e}")
\ No newline at end of file
+        pytest.fail(f"read_template test failed with an exception: {e}")
+
+@pytest.mark.skipif(fn_template.name not in DATA_FILES, reason="Template file not found")
+def test_read_template_matches_hdf5():
+    """
+    Test that rl.read_template() returns the same values as reading
+    the template dataset with h5py directly.
+    """
+    import h5py
+    with h5py.File(fn_template, 'r') as f:
+        expected = f['template'][...]
+
+    template_p, template_c = rl.read_template(str(fn_template))
+    assert np.array_equal(template_p, expected[0]), "Template (plus) values differ from the file"
+    assert np.array_equal(template_c, expected[1]), "Template (cross) values differ from the file"
\ No newline at end of file
@@ -2,12 +2,17 @@ import pytest
 import numpy as np
 from scipy.interpolate import interp1d
 from scipy.io.wavfile import read as wavread
+from matplotlib import mlab
 from ligotools import utils
 import os
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_data():
-    """ Create sample data for testing """
+    """
+    Create sample data for testing.
+    Built once per session; the arrays are read-only so no test can
+    modify them for the tests that run after it.
+    """
     fs = 4096
     dt = 1.0 / fs
     Nt = 10 * fs  # 10 seconds of data
@@ -21,6 +26,8 @@ def sample_data():
     psd_vals = np.ones_like(freqs)
     interp_psd = interp1d(freqs, psd_vals)
     
+    strain.setflags(write=False)
+    times.setflags(write=False)
     return strain, interp_psd, dt, fs, times
 
 def test_whiten(sample_data):
@@ -39,6 +46,59 @@ def test_whiten(sample_data):
     # but we can check it's a numpy array
     assert isinstance(whitened_strain, np.ndarray)
 
+def test_whiten_precomputed_inv_asd(sample_data):
+    """
+    Passing precomputed whitening weights should give the same result
+    as letting whiten() evaluate the PSD itself.
+    """
+    strain, interp_psd, dt, _, _ = sample_data
+    
+    freqs = np.fft.rfftfreq(len(strain), dt)
+    inv_asd = 1.0 / (np.sqrt(interp_psd(freqs)) * np.sqrt(2 * dt))
+    
+    whitened_strain = utils.whiten(strain, interp_psd, dt)
+    whitened_precomputed = utils.whiten(strain, interp_psd, dt, inv_asd=inv_asd)
+    
+    assert np.allclose(whitened_strain, whitened_precomputed)
+
+def test_whiten_float32(sample_data):
+    """
+    float32 input (e.g. the LOSC templates) should be whitened in
+    double precision, giving the same float64 result as float64 input.
+    """
+    strain, interp_psd, dt, _, _ = sample_data
+    strain32 = strain.astype(np.float32)
+    
+    whitened_strain = utils.whiten(strain32, interp_psd, dt)
+    
+    assert whitened_strain.dtype == np.float64
+    assert np.allclose(whitened_strain, utils.whiten(strain32.astype(np.float64), interp_psd, dt),
+                       rtol=1e-12, atol=0)
+
+def test_whiten_caches_inv_asd(sample_data):
+    """
+    Whitening twice with the same PSD should reuse the cached weights.
+    """
+    strain, interp_psd, dt, _, _ = sample_data
+    
+    inv_asd = utils._inv_asd(interp_psd, len(strain), dt)
+    
+    assert utils._inv_asd(interp_psd, len(strain), dt) is inv_asd
+    assert np.allclose(utils.whiten(strain, interp_psd, dt),
+                       utils.whiten(strain, interp_psd, dt, inv_asd=inv_asd))
+
+def test_aligned_empty():
+    """
+    _aligned_empty should return a C-contiguous array of the requested
+    shape and dtype whose data starts on a 64-byte boundary.
+    """
+    arr = utils._aligned_empty((3, 5), np.complex128)
+    
+    assert arr.shape == (3, 5)
+    assert arr.dtype == np.complex128
+    assert arr.flags.c_contiguous
+    assert arr.ctypes.data % 64 == 0
+
 def test_reqshift(sample_data):
     """
     Test the reqshift function.
@@ -60,6 +120,55 @@ def test_reqshift(sample_data):
     # Check if the peak is close to the expected 250 Hz
     assert np.isclose(peak_freq, 200.0 + fshift, atol=1.0)
 
+def test_reqshift_negative(sample_data):
+    """
+    A negative fshift should move the 200 Hz peak down to 150 Hz.
+    """
+    strain, _, _, fs, _ = sample_data
+    
+    shifted_strain = utils.reqshift(strain, fshift=-50.0, sample_rate=fs)
+    
+    freqs = np.fft.rfftfreq(len(shifted_strain), 1.0/fs)
+    peak_freq = freqs[np.argmax(np.abs(np.fft.rfft(shifted_strain)))]
+    
+    assert np.isclose(peak_freq, 150.0, atol=1.0)
+
+def test_reqshift_float32(sample_data):
+    """
+    float32 input should stay in single precision and still be shifted
+    from 200 Hz to 250 Hz.
+    """
+    strain, _, _, fs, _ = sample_data
+    
+    shifted_strain = utils.reqshift(strain.astype(np.float32), fshift=50.0, sample_rate=fs)
+    
+    freqs = np.fft.rfftfreq(len(shifted_strain), 1.0/fs)
+    peak_freq = freqs[np.argmax(np.abs(np.fft.rfft(shifted_strain)))]
+    
+    assert shifted_strain.dtype == np.float32
+    assert np.isclose(peak_freq, 250.0, atol=1.0)
+
+def test_reqshift_odd_length(sample_data):
+    """
+    reqshift should return the same number of samples it was given,
+    including for odd-length input.
+    """
+    strain, _, _, fs, _ = sample_data
+    
+    shifted_strain = utils.reqshift(strain[:-1], fshift=50.0, sample_rate=fs)
+    
+    assert len(shifted_strain) == len(strain) - 1
+
+def test_reqshift_zero_shift(sample_data):
+    """
+    A shift smaller than one frequency bin should leave the data unchanged.
+    """
+    strain, _, _, fs, _ = sample_data
+    
+    shifted_strain = utils.reqshift(strain, fshift=0.0, sample_rate=fs)
+    
+    assert np.allclose(shifted_strain, strain)
+
 def test_write_wavfile(sample_data, tmp_path):
     """
     Test the write_wavfile function.
@@ -89,4 +198,57 @@ def test_write_wavfile(sample_data, tmp_path):
     assert data_read_scaled.shape == strain.shape
     
     # Check that the data is scaled to int16
-    assert data_read_scaled.dtype == np.int16
\ No newline at end of file
+    assert data_read_scaled.dtype == np.int16
+
+def test_write_wavfile_values(sample_data, tmp_path):
+    """
+    The samples read back should match the original scaling,
+    int16(data/max(|data|)*32767*0.9), for float and integer input.
+    """
+    strain, _, _, fs, _ = sample_data
+    
+    inputs = [strain,
+              strain.astype(np.float32),
+              np.int16(strain * 1000),
+              np.array([1, 2, 3], dtype=np.uint8)]
+    for data in inputs:
+        temp_wav_file = tmp_path / f"test_{data.dtype}.wav"
+        utils.write_wavfile(temp_wav_file, fs, data)
+        _, data_read_scaled = wavread(temp_wav_file)
+        
+        expected = np.int16(data/np.max(np.abs(data)) * 32767 * 0.9)
+        assert np.array_equal(data_read_scaled, expected), f"Samples differ for {data.dtype} input"
+
+def test_compute_psd(sample_data):
+    """
+    Test the compute_psd function.
+    The Welch estimate should agree with mlab.psd, which the
+    tutorial originally used, and peak at the 200 Hz sine.
+    """
+    strain, _, _, fs, _ = sample_data
+    NFFT = 4 * fs
+    
+    freqs, Pxx_H1, Pxx_L1 = utils.compute_psd(strain, 2 * strain, fs, NFFT)
+    Pxx_mlab, freqs_mlab = mlab.psd(strain, Fs=fs, NFFT=NFFT)
+    
+    assert np.allclose(freqs, freqs_mlab)
+    assert np.allclose(Pxx_H1, Pxx_mlab, rtol=1e-3, atol=1e-3 * Pxx_mlab.max())
+    assert np.allclose(Pxx_L1, 4 * Pxx_H1)
+    assert np.isclose(freqs[np.argmax(Pxx_H1)], 200.0)
+
+def test_compute_psd_window(sample_data):
+    """
+    With a window array and overlap, as in the notebook's matched-filter
+    cell, compute_psd should reproduce mlab.psd.
+    """
+    strain, _, _, fs, _ = sample_data
+    NFFT = 4 * fs
+    psd_window = np.blackman(NFFT)
+    
+    freqs, Pxx_H1, _ = utils.compute_psd(strain, strain, fs, NFFT,
+                                         noverlap=NFFT//2, window=psd_window)
+    Pxx_mlab, freqs_mlab = mlab.psd(strain, Fs=fs, NFFT=NFFT,
+                                    window=psd_window, noverlap=NFFT//2)
+    
+    assert np.allclose(freqs, freqs_mlab)
+    assert np.allclose(Pxx_H1, Pxx_mlab)
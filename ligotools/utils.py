@@ -1,4 +1,8 @@
 import numpy as np
+# scipy.fft caches pocketfft plans per transform length, so repeated
+# whiten/reqshift calls on same-length data reuse them. Callers who want
+# FFTW can wrap calls in scipy.fft.set_backend(pyfftw.interfaces.scipy_fft).
+from scipy.fft import rfft, irfft, rfftfreq
 from scipy.signal import welch
 from scipy.io.wavfile import write as wavwrite
 from scipy.interpolate import interp1d
@@ -6,7 +10,47 @@ import matplotlib.pyplot as plt
 
 # --- Core Utility Functions ---
 
-def whiten(strain, interp_psd, dt):
+def _aligned_empty(shape, dtype, align=64):
+    """
+    Like np.empty, but with the data pointer aligned to align bytes
+    (64 = one cache line / AVX-512 register).
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = -buf.ctypes.data % align
+    return buf[offset:offset + nbytes].view(dtype).reshape(shape)
+
+# Whitening weights from _inv_asd, keyed by (id(interp_psd), Nt, dt).
+# Each entry also holds interp_psd itself so its id cannot be reused
+# by another object while the entry is alive.
+_asd_cache = {}
+_ASD_CACHE_SIZE = 8
+
+def _inv_asd(interp_psd, Nt, dt):
+    """
+    Whitening weights 1/(ASD * norm) on the rfft frequency grid of Nt samples.
+    Results are cached so repeated calls with the same PSD skip the interpolation.
+    """
+    key = (id(interp_psd), Nt, dt)
+    if key in _asd_cache:
+        return _asd_cache[key][1]
+    
+    freqs = rfftfreq(Nt, dt)
+    # real(interp_psd) is needed to protect against tiny imaginary parts 
+    # introduced by interpolation.
+    norm = 1./np.sqrt(1./(dt*2))
+    inv_asd = _aligned_empty(freqs.shape, np.float64)
+    np.sqrt(np.real(interp_psd(freqs)), out=inv_asd)
+    np.divide(1./norm, inv_asd, out=inv_asd)
+    inv_asd.setflags(write=False)
+    
+    if len(_asd_cache) >= _ASD_CACHE_SIZE:
+        _asd_cache.clear()
+    _asd_cache[key] = (interp_psd, inv_asd)
+    return inv_asd
+
+def whiten(strain, interp_psd, dt, inv_asd=None):
     """
     Whiten strain data.
     
@@ -14,21 +58,25 @@ def whiten(strain, interp_psd, dt):
     strain (np.ndarray): Strain time series
     interp_psd (scipy.interpolate.interp1d): Interpolated PSD
     dt (float): Time step
+    inv_asd (np.ndarray, optional): Precomputed whitening weights on the
+        rfftfreq(len(strain), dt) grid; computed from interp_psd
+        (and cached for later calls) if None
     
     Returns:
     np.ndarray: Whitened strain data
     """
     Nt = len(strain)
-    freqs = np.fft.rfftfreq(Nt, dt)
+    if inv_asd is None:
+        inv_asd = _inv_asd(interp_psd, Nt, dt)
     
     # whitening: transform to frequency domain, divide by ASD, then transform back, 
     # taking care to get normalization right.
-    hf = np.fft.rfft(strain)
-    # real(interp_psd) is needed to protect against tiny imaginary parts 
-    # introduced by interpolation.
-    norm = 1./np.sqrt(1./(dt*2))
-    white_hf = hf / (np.sqrt(np.real(interp_psd(freqs))) * norm)
-    white_ht = np.fft.irfft(white_hf, n=Nt)
+    # The division is done in place on the rfft buffer so it is only traversed once;
+    # NumPy multiplies the complex bins by the real weights in a single loop.
+    # transform in double precision, as np.fft.rfft did, whatever the input dtype
+    hf = rfft(np.asarray(strain, dtype=np.float64), workers=-1)
+    np.multiply(hf, inv_asd, out=hf)
+    white_ht = irfft(hf, n=Nt, workers=-1, overwrite_x=True)
     return white_ht
 
 def write_wavfile(filename,fs,data):
@@ -40,13 +88,42 @@ def write_wavfile(filename,fs,data):
     fs (int): Sample rate
     data (np.ndarray): Strain time series
     """
-    d = np.int16(data/np.max(np.abs(data)) * 32767 * 0.9)
+    # max(|data|) from the two extrema, without an |data| temporary;
+    # negate in float so unsigned and int16 minima cannot wrap around
+    amax = max(float(np.max(data)), -float(np.min(data)))
+    # scale in the same order as data/amax*32767*0.9, reusing one buffer
+    # in data's float precision; the last multiply casts straight into int16
+    scaled = np.divide(data, amax)
+    np.multiply(scaled, 32767, out=scaled)
+    d = np.empty(np.shape(data), dtype=np.int16)
+    np.multiply(scaled, 0.9, out=d, casting='unsafe')
     wavwrite(filename,int(fs),d)
 
+def _bin_shift(x, nbins):
+    """
+    Shift the rfft bins of x by nbins in place, zero-filling the vacated bins.
+    
+    Overlapping 1-D slice assignments with matching strides are copied by
+    NumPy as a memmove, so the shift needs no temporary buffer.
+    """
+    # fshift > 0 => move signals to higher frequencies
+    if nbins > 0:
+        x[nbins:] = x[:-nbins]
+        x[:nbins] = 0.
+    # fshift < 0 => move signals to lower frequencies
+    elif nbins < 0:
+        x[:nbins] = x[-nbins:]
+        x[nbins:] = 0.
+    return x
+
 def reqshift(data,fshift=100,sample_rate=4096):
     """
     Frequency shift data by fshift Hz.
     
+    The precision of data is kept: float32 input (e.g. whitened strain
+    headed for write_wavfile) is shifted with a complex64 spectrum,
+    halving the memory traffic of the float64 path.
+    
     Parameters:
     data (np.ndarray): Strain time series
     fshift (float): Frequency shift in Hz
@@ -55,20 +132,42 @@ def reqshift(data,fshift=100,sample_rate=4096):
     Returns:
     np.ndarray: Frequency-shifted data
     """
-    x = np.fft.rfft(data)
+    x = rfft(data, workers=-1)
     T = len(data)/sample_rate
     df = 1.0/T
     nbins = int(fshift/df)
     # print T,df,nbins,len(x)
-    # fshift < 0 => move signals to higher frequencies
-    if fshift > 0:
-        x[nbins:] = x[:-nbins]
-        x[:nbins] = 0.
-    # fshift > 0 => move signals to lower frequencies
-    else:
-        x[:-nbins] = x[nbins:]
-        x[-nbins:] = 0.
-    return np.fft.irfft(x)
+    _bin_shift(x, nbins)
+    # pass the original length so odd-length input round-trips exactly
+    return irfft(x, n=len(data), workers=-1, overwrite_x=True)
+
+def compute_psd(strain_H1, strain_L1, fs, NFFT, noverlap=0, window='hann'):
+    """
+    Compute the Power Spectral Densities of H1 and L1 with Welch's method.
+    Uses no detrending and, by default, a Hann window, matching mlab.psd's defaults.
+    
+    Every segment is transformed with scipy.fft at the same length NFFT,
+    so the FFT plan is built once and reused. NFFT should be a power of
+    two (e.g. 4*fs for fs = 4096); other lengths fall back to slower
+    mixed-radix or Bluestein transforms.
+    
+    Parameters:
+    strain_H1 (np.ndarray): Strain time series for H1
+    strain_L1 (np.ndarray): Strain time series for L1, same length as H1
+    fs (int): Sample rate
+    NFFT (int): Number of samples per segment
+    noverlap (int): Number of samples shared by neighbouring segments
+    window (str or np.ndarray): Window name or array of length NFFT
+    
+    Returns:
+    tuple: (freqs, Pxx_H1, Pxx_L1), suitable for plot_asd
+    """
+    # stack both detectors into one (2, Nt) array so a single welch call
+    # segments and transforms them together
+    strain = np.stack([strain_H1, strain_L1])
+    freqs, Pxx = welch(strain, fs=fs, window=window, nperseg=NFFT,
+                       noverlap=noverlap, detrend=False, axis=-1)
+    return freqs, Pxx[0], Pxx[1]
 
 # --- Plotting Utility Functions ---
 